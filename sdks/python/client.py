@@ -11,35 +11,52 @@ else:
     print("Python 2.X detected")
     import SocketServer as ss
 
+DIRECTIONS = ('N', 'S', 'E', 'W')
+EMPTY_RESPONSE = b'{"commands":[]}\n' # pre-encoded reply for turns with nothing to do
+
 
 class NetworkHandler(ss.StreamRequestHandler):
+    disable_nagle_algorithm = True # send each turn's reply without delay
+
     def handle(self):
         game = Game()
+        # bound once so the per-turn loop skips the global/attribute lookups
+        readline, write = self.rfile.readline, self.wfile.write
+        loads, dumps = json.loads, json.dumps
+        get_move = game.get_random_move
 
         while True:
-            data = self.rfile.readline().decode() # reads until '\n' encountered
-            json_data = json.loads(str(data))
+            data = readline().decode() # reads until '\n' encountered
+            json_data = loads(data)
             # uncomment the following line to see pretty-printed data
             # print(json.dumps(json_data, indent=4, sort_keys=True))
-            response = game.get_random_move(json_data).encode()
-            self.wfile.write(response)
+            command = get_move(json_data)
+            if not command['commands']:
+                write(EMPTY_RESPONSE)
+                continue
+            response = dumps(command, separators=(',',':')) + '\n'
+            write(response.encode())
 
 
 
 class Game:
     def __init__(self):
         self.units = set() # set of unique unit ids
-        self.directions = ['N', 'S', 'E', 'W']
+        self.unit_ids = [] # same ids, kept as a sequence for random.choice
+        self.rng = random.Random() # per-game generator, seed it to replay a game
 
     def get_random_move(self, json_data):
-        units = set([unit['id'] for unit in json_data['unit_updates'] if unit['type'] != 'base'])
-        self.units |= units # add any additional ids we encounter
-        unit = random.choice(tuple(self.units))
-        direction = random.choice(self.directions)
+        for update in json_data['unit_updates']:
+            if update['type'] != 'base' and update['id'] not in self.units:
+                self.units.add(update['id']) # only newly seen ids are added
+                self.unit_ids.append(update['id'])
+        if not self.unit_ids:
+            return {"commands": []}
+        unit = self.rng.choice(self.unit_ids)
+        direction = self.rng.choice(DIRECTIONS)
         move = 'MOVE'
         command = {"commands": [{"command": move, "unit": unit, "dir": direction}]}
-        response = json.dumps(command, separators=(',',':')) + '\n'
-        return response
+        return command
 
 if __name__ == "__main__":
     port = int(sys.argv[1]) if (len(sys.argv) > 1 and sys.argv[1]) else 9090